@@ -0,0 +1,282 @@
+import argparse
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from dash import dcc, html, Input, Output
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+import dash_bootstrap_components as dbc
+
+from datasets import get_datasets
+from co2_predictive_modeling import SARIMA_ORDER, SARIMA_SEASONAL_ORDER
+
+# Where the error tables are written, and read back by the dashboard
+BACKTEST_DIR = os.environ.get("BACKTEST_DIR", "backtest_results")
+CO2_RESULTS_FILE = os.path.join(BACKTEST_DIR, "co2_errors.csv")
+TEMPERATURE_RESULTS_FILE = os.path.join(BACKTEST_DIR, "temperature_errors.csv")
+
+# Default study settings
+MAX_HORIZON = 10  # Years ahead
+MIN_TRAIN = 30  # Years of history before the first origin
+REFIT_EVERY = 10  # Re-estimate parameters every N origins (0 = only once)
+
+TEMPERATURE_SERIES = "WORLD"
+
+
+def rolling_origin_errors(values, max_horizon=MAX_HORIZON, min_train=MIN_TRAIN, refit_every=REFIT_EVERY):
+    """
+    Replays SARIMA forecasts from every historical origin of a series.
+
+    The model is fitted once on the first min_train observations. Each later origin only
+    extends the fitted state with the new observations (a Kalman filter update, no
+    re-estimation); parameters are re-estimated every refit_every origins, warm-started
+    from the previous ones.
+
+    Returns:
+    - Forecast errors, array of shape (origins, max_horizon), NaN where the horizon runs past the data
+    - Actual values at the same positions
+    """
+    values = np.asarray(values, dtype=float)
+    n_origins = len(values) - min_train
+    errors = np.full((max(n_origins, 0), max_horizon), np.nan)
+    actuals = np.full_like(errors, np.nan)
+    if n_origins <= 0:
+        return errors, actuals
+
+    def fit(end, start_params=None):
+        model = SARIMAX(values[:end], order=SARIMA_ORDER, seasonal_order=SARIMA_SEASONAL_ORDER)
+        return model.fit(start_params=start_params, disp=False)
+
+    results = fit(min_train)
+    params = results.params
+    filtered_to = min_train
+    for i, origin in enumerate(range(min_train, len(values))):
+        if refit_every and i and i % refit_every == 0:
+            results = fit(origin, start_params=params)
+            params = results.params
+        elif origin > filtered_to:
+            results = results.extend(values[filtered_to:origin])
+        filtered_to = origin
+
+        steps = min(max_horizon, len(values) - origin)
+        forecast = np.asarray(results.forecast(steps))
+        errors[i, :steps] = forecast - values[origin:origin + steps]
+        actuals[i, :steps] = values[origin:origin + steps]
+    return errors, actuals
+
+
+def summarize_errors(errors, actuals):
+    """
+    Reduces the error matrix to forecast count, MAE and MAPE (%) per horizon.
+    """
+    valid = ~np.isnan(errors)
+    abs_errors = np.abs(errors)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_errors = np.where(actuals != 0, abs_errors / np.abs(actuals) * 100, np.nan)
+        mae = np.nanmean(abs_errors, axis=0)
+        mape = np.nanmean(pct_errors, axis=0)
+    return valid.sum(axis=0), mae, mape
+
+
+def backtest_series(task):
+    """
+    Backtests one series; the unit of work sent to the process pool.
+
+    Returns the error table rows of the series (empty if it is too short or fails to fit).
+    """
+    series_id, name, values, max_horizon, min_train, refit_every = task
+    # Leading and trailing gaps carry no information for the backtest
+    values = pd.Series(values, dtype=float)
+    valid = values.notna()
+    if valid.sum() <= min_train:
+        return []
+    values = values[valid.idxmax():valid[::-1].idxmax() + 1].to_numpy()
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            errors, actuals = rolling_origin_errors(values, max_horizon, min_train, refit_every)
+            counts, mae, mape = summarize_errors(errors, actuals)
+    except Exception as exc:
+        print(f"Skipping {series_id}: {exc}")
+        return []
+
+    return [
+        {"series": series_id, "name": name, "horizon": horizon + 1,
+         "forecasts": int(counts[horizon]), "mae": mae[horizon], "mape": mape[horizon]}
+        for horizon in range(max_horizon) if counts[horizon]
+    ]
+
+
+def run_backtests(tasks, jobs):
+    rows = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for done, series_rows in enumerate(pool.map(backtest_series, tasks, chunksize=4), start=1):
+            rows.extend(series_rows)
+            if done % 25 == 0 or done == len(tasks):
+                print(f"{done}/{len(tasks)} series backtested")
+    return pd.DataFrame(rows, columns=["series", "name", "horizon", "forecasts", "mae", "mape"])
+
+
+def save_results(results, path):
+    # Write then rename, so the dashboard never reads a half-written table
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    results.to_csv(path + ".tmp", index=False, float_format="%.6g")
+    os.replace(path + ".tmp", path)
+
+
+_results_cache = {}
+
+
+def load_results(path):
+    """
+    Reads an error table, cached until the file changes. Returns None if it has not been produced yet.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _results_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, pd.read_csv(path))
+        _results_cache[path] = cached
+    return cached[1]
+
+
+def load_all_results():
+    # Temperature and CO2 tables side by side, the temperature series first
+    tables = [table for table in (load_results(TEMPERATURE_RESULTS_FILE), load_results(CO2_RESULTS_FILE))
+              if table is not None]
+    if not tables:
+        return None
+    return pd.concat(tables, ignore_index=True)
+
+
+# Layout for the backtesting feature
+def get_backtesting_layout():
+    results = load_all_results()
+    if results is None:
+        return html.Div([
+            html.H2("Forecast Backtesting"),
+            html.P("No backtest results yet. Run `python backtesting.py` to produce them."),
+        ])
+
+    series = results.drop_duplicates("series")
+    # MAE is in each series' own unit, so only the CO2 countries are summarized together
+    co2_results = results[results["series"] != TEMPERATURE_SERIES]
+    summary = co2_results.groupby("horizon").agg(
+        series=("series", "nunique"), median_mae=("mae", "median"), median_mape=("mape", "median")
+    ).reset_index()
+
+    return html.Div([
+        html.H2("Forecast Backtesting"),
+        html.P(
+            "Rolling-origin backtest of the SARIMA forecasters: every historical year is used as a forecast "
+            "origin and the forecasts are compared with what actually happened, for each horizon."
+        ),
+
+        # Median error across countries
+        html.H4("CO2 Forecasts: Median Error Across Countries"),
+        dbc.Table(
+            [
+                html.Thead(html.Tr([html.Th("Horizon (years)"), html.Th("Countries"),
+                                    html.Th("Median MAE"), html.Th("Median MAPE")])),
+                html.Tbody([
+                    html.Tr([
+                        html.Td(row.horizon),
+                        html.Td(row.series),
+                        html.Td(f"{row.median_mae:,.3f}"),
+                        html.Td(f"{row.median_mape:.1f}%"),
+                    ]) for row in summary.itertuples()
+                ]),
+            ],
+            striped=True,
+            hover=True,
+            responsive=True,
+        ),
+
+        # Per-series errors
+        html.Label("Select a Series:"),
+        dcc.Dropdown(
+            id="backtest-series-selector",
+            options=[{"label": row.name, "value": row.series} for row in series.itertuples()],
+            value=series["series"].iloc[0],
+            clearable=False,
+        ),
+        dcc.Graph(id="backtest-graph"),
+    ])
+
+
+# Callback for the backtesting feature
+def register_backtesting_callbacks(app):
+    @app.callback(
+        Output("backtest-graph", "figure"),
+        [Input("backtest-series-selector", "value")]
+    )
+    def update_backtest_graph(series_id):
+        results = load_all_results()
+        if results is None:
+            return go.Figure()
+        series_results = results[results["series"] == series_id]
+
+        fig = go.Figure()
+        fig.add_trace(go.Bar(x=series_results["horizon"], y=series_results["mae"], name="MAE"))
+        fig.add_trace(go.Scatter(
+            x=series_results["horizon"],
+            y=series_results["mape"],
+            mode="lines+markers",
+            name="MAPE (%)",
+            yaxis="y2",
+        ))
+        fig.update_layout(
+            title=f"Forecast Error by Horizon: {series_results['name'].iloc[0] if len(series_results) else series_id}",
+            xaxis_title="Horizon (years)",
+            yaxis=dict(title="MAE"),
+            yaxis2=dict(title="MAPE (%)", overlaying="y", side="right"),
+            template="plotly_white",
+        )
+        return fig
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the CO2 and temperature forecasters.")
+    parser.add_argument("--max-horizon", type=int, default=MAX_HORIZON)
+    parser.add_argument("--min-train", type=int, default=MIN_TRAIN)
+    parser.add_argument("--refit-every", type=int, default=REFIT_EVERY)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--countries", default=None, help="Comma-separated country codes (default: all)")
+    parser.add_argument("--skip-temperature", action="store_true")
+    args = parser.parse_args()
+
+    datasets = get_datasets()
+    settings = (args.max_horizon, args.min_train, args.refit_every)
+    start = time.perf_counter()
+
+    if not args.skip_temperature:
+        yearly = datasets.temperature_yearly.sort_values("Year")
+        rows = backtest_series((TEMPERATURE_SERIES, "World (temperature anomaly)",
+                                yearly["Monthly Anomaly"].to_numpy()) + settings)
+        save_results(pd.DataFrame(rows, columns=["series", "name", "horizon", "forecasts", "mae", "mape"]),
+                     TEMPERATURE_RESULTS_FILE)
+        print(f"Temperature backtest written to {TEMPERATURE_RESULTS_FILE}")
+
+    # One entry per country code, named after its most recent year (e.g. TUR, renamed Turkiye)
+    co2 = datasets.co2_by_country.sort_values("year", kind="stable")
+    countries = co2.groupby("country_code")["country_name"].last().to_dict()
+    if args.countries:
+        selected = set(args.countries.split(","))
+        countries = {code: name for code, name in countries.items() if code in selected}
+    grouped = dict(tuple(co2.groupby("country_code")))
+    tasks = [(code, name, grouped[code]["value"].to_numpy()) + settings for code, name in countries.items()]
+
+    save_results(run_backtests(tasks, args.jobs), CO2_RESULTS_FILE)
+    print(f"CO2 backtest of {len(tasks)} countries written to {CO2_RESULTS_FILE} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
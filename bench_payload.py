@@ -0,0 +1,61 @@
+import gzip
+
+import plotly.io as pio
+
+import figure_utils
+from datasets import CO2_FILE, GDP_FILE
+from gdp_co2 import get_gdp_co2_predictive_modeling_layout
+from headless import collect_callbacks, find_figure
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, the column is skipped without it
+    brotli = None
+
+# (label, output graph id, callback arguments) for each graph in the dashboard
+CASES = [
+    ("Heatmap", "climate-graph", ([1960, 2020], "thermal")),
+    ("Line Chart", "line-chart-graph", ([1960, 2020], "solid")),
+    ("Choropleth", "choropleth-map", ([1960, 2020],)),
+    ("Temperature Forecast", "predictive-model-graph", (2050, "interval")),
+    ("Temperature Fan Chart", "predictive-model-graph", (2050, "fan")),
+    ("CO2 Forecast (USA)", "co2-predictive-model-graph", ("USA", 2033, "interval")),
+    ("CO2 Fan Chart (USA)", "co2-predictive-model-graph", ("USA", 2033, "fan")),
+    ("GDP vs CO2", "gdp-co2-plot", None),
+]
+
+
+def build_figure(callbacks, graph_id, args):
+    if args is None:
+        # The GDP vs CO2 figure is built with its layout rather than by a callback
+        return find_figure(get_gdp_co2_predictive_modeling_layout(CO2_FILE, GDP_FILE), graph_id)
+    return callbacks[graph_id](*args)
+
+
+def payload_sizes(figure, graph_id):
+    # Approximates the body of a _dash-update-component response
+    body = '{"multi":true,"response":{"%s":{"figure":%s}}}' % (graph_id, pio.to_json(figure, validate=False))
+    data = body.encode("utf-8")
+    sizes = {"raw": len(data), "gzip": len(gzip.compress(data, compresslevel=6))}
+    if brotli is not None:
+        sizes["br"] = len(brotli.compress(data, quality=4))
+    return sizes
+
+
+def main():
+    callbacks = collect_callbacks()
+    encodings = ["raw", "gzip"] + (["br"] if brotli is not None else [])
+
+    header = f"{'Callback':<22}" + "".join(f"{'before ' + e:>14}{'after ' + e:>14}" for e in encodings)
+    print(header)
+    print("-" * len(header))
+    for label, graph_id, args in CASES:
+        figure_utils.OPTIMIZE_FIGURES = False
+        before = payload_sizes(build_figure(callbacks, graph_id, args), graph_id)
+        figure_utils.OPTIMIZE_FIGURES = True
+        after = payload_sizes(build_figure(callbacks, graph_id, args), graph_id)
+        print(f"{label:<22}" + "".join(f"{before[e]:>14,}{after[e]:>14,}" for e in encodings))
+
+
+if __name__ == "__main__":
+    main()
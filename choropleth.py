@@ -1,12 +1,15 @@
-import pandas as pd
 import plotly.express as px
 from dash import dcc, html, Input, Output
 
-# Load the CO2 emissions dataset
-df = pd.read_csv("data/co2_emissions.csv")
+from datasets import get_datasets
+from figure_utils import optimize_figure
+from profiling import profiled
 
 # Layout for the choropleth map feature
 def get_choropleth_layout():
+    # Load the CO2 emissions dataset from the current data snapshot
+    df = get_datasets().co2
+
     return html.Div([
         html.H2("Choropleth Map: Global CO₂ Emissions"),
 
@@ -31,8 +34,10 @@ def register_choropleth_callbacks(app):
         Output("choropleth-map", "figure"),
         [Input("choropleth-year-slider", "value")]
     )
+    @profiled("choropleth")
     def update_choropleth(year_range):
         # Filter data by the selected year range
+        df = get_datasets().co2
         filtered_data = df[(df["year"] >= year_range[0]) & (df["year"] <= year_range[1])]
 
         # Aggregate data by country within the selected year range
@@ -56,5 +61,5 @@ def register_choropleth_callbacks(app):
             geo=dict(showframe=False, showcoastlines=True, projection_type="equirectangular"),
             margin={"r": 0, "t": 40, "l": 0, "b": 0},
         )
-        return fig
+        return optimize_figure(fig, decimals=1)
 
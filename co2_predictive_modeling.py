@@ -1,20 +1,44 @@
-import pandas as pd
+import numpy as np
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 from dash import dcc, html, Input, Output
 import plotly.graph_objects as go
 
-# Load the dataset
-df = pd.read_csv("data/co2_emissions.csv")
-
-# Group and structure data
-df = df.groupby(["country_code", "country_name", "year"])["value"].mean().reset_index()
+from datasets import get_datasets
+from figure_utils import optimize_figure
+from forecast_bands import UNCERTAINTY_MODES, add_uncertainty_traces
+from model_store import load_or_fit
+from profiling import profiled
 
 # Default settings
 DEFAULT_COUNTRY_CODE = "USA"
 DEFAULT_YEAR = 2033
 
+# SARIMA hyperparameters, also part of the model store key
+SARIMA_ORDER = (1, 1, 1)
+SARIMA_SEASONAL_ORDER = (1, 1, 1, 12)
+
+
+def fit_country_sarima(country_code, series):
+    # Fit the per-country SARIMA model, or load it from the model store if this series was fitted before
+    def model():
+        return SARIMAX(series, order=SARIMA_ORDER, seasonal_order=SARIMA_SEASONAL_ORDER)
+
+    return load_or_fit(
+        f"co2_sarima_{country_code}",
+        {"order": SARIMA_ORDER, "seasonal_order": SARIMA_SEASONAL_ORDER},
+        series,
+        lambda: model().fit(disp=False),
+        # Only the fitted parameters are stored; filtering with them rebuilds the results cheaply
+        dump=lambda results: np.asarray(results.params),
+        restore=lambda stored_params: model().filter(stored_params),
+    )
+
 # Layout for predictive modeling
 def get_co2_predictive_modeling_layout():
+    # Load the dataset, grouped by country and year
+    datasets = get_datasets()
+    df = datasets.co2_by_country
+
     return html.Div([
         html.H2("Predictive Modeling: CO2 Emissions"),
 
@@ -29,7 +53,7 @@ def get_co2_predictive_modeling_layout():
                     id="country-dropdown",
                     options=[
                         {"label": country, "value": code}
-                        for code, country in df.groupby(["country_code", "country_name"]).size().index
+                        for code, country in datasets.co2_countries
                     ],
                     value=DEFAULT_COUNTRY_CODE,
                     placeholder="Select a country",
@@ -49,21 +73,35 @@ def get_co2_predictive_modeling_layout():
             ], style={"flex": "1", "paddingLeft": "10px"}),
         ], style={"display": "flex", "marginBottom": "20px"}),
 
+        # Uncertainty display selection
+        html.Div([
+            html.Label("Forecast Uncertainty:"),
+            dcc.RadioItems(
+                id="co2-uncertainty-mode",
+                options=UNCERTAINTY_MODES,
+                value="interval",
+                inline=True,
+            ),
+        ]),
+
     ], style={"padding": "20px"})
 
 # Callback for predictive modeling
 def register_co2_predictive_modeling_callbacks(app):
     @app.callback(
         Output("co2-predictive-model-graph", "figure"),
-        [Input("country-dropdown", "value"), Input("forecast-year-input", "value")]
+        [Input("country-dropdown", "value"), Input("forecast-year-input", "value"),
+         Input("co2-uncertainty-mode", "value")]
     )
-    def update_co2_predictive_model(country_code, target_year):
+    @profiled("co2_forecast")
+    def update_co2_predictive_model(country_code, target_year, uncertainty_mode="interval"):
         # Use default values if no input
         if not country_code:
             country_code = DEFAULT_COUNTRY_CODE
         if not target_year:
             target_year = DEFAULT_YEAR
 
+        df = get_datasets().co2_by_country
         country_data = df[df["country_code"] == country_code]
         if country_data.empty:
             return go.Figure().update_layout(title="No data available for the selected country.")
@@ -73,15 +111,14 @@ def register_co2_predictive_modeling_callbacks(app):
             target_year = country_data["year"].max() + 1
 
         # SARIMA Model
-        model = SARIMAX(country_data["value"], order=(1, 1, 1), seasonal_order=(1, 1, 1, 12))
-        model_fit = model.fit(disp=False)
+        model_fit = fit_country_sarima(country_code, country_data["value"])
 
-        forecast_start = country_data["year"].max()
-        forecast_steps = target_year - forecast_start + 1
+        # The forecast starts the year after the last observation
+        forecast_start = int(country_data["year"].max()) + 1
+        forecast_steps = int(target_year) - forecast_start + 1
         forecast = model_fit.get_forecast(steps=forecast_steps)
-        forecast_ci = forecast.conf_int(alpha=0.10)
 
-        forecast_years = list(range(forecast_start, target_year + 1))
+        forecast_years = np.arange(forecast_start, forecast_start + forecast_steps)
 
         # Initialize figure
         fig = go.Figure()
@@ -102,15 +139,8 @@ def register_co2_predictive_modeling_callbacks(app):
             name="Forecast",
         ))
 
-        # Confidence interval
-        fig.add_trace(go.Scatter(
-            x=forecast_years + forecast_years[::-1],
-            y=list(forecast_ci.iloc[:, 0]) + list(forecast_ci.iloc[:, 1])[::-1],
-            fill="toself",
-            name="Confidence Interval",
-            mode="lines",
-            line_color="rgba(0,0,0,0)",
-        ))
+        # 90% confidence interval, or the fan chart bands
+        add_uncertainty_traces(fig, forecast_years, forecast, uncertainty_mode, interval_level=0.90)
 
         # Update layout
         fig.update_layout(
@@ -120,4 +150,4 @@ def register_co2_predictive_modeling_callbacks(app):
             template="plotly_white",
         )
 
-        return fig
+        return optimize_figure(fig, decimals=1)
@@ -0,0 +1,189 @@
+import fcntl
+import hashlib
+import io
+import os
+import threading
+import time
+
+import pandas as pd
+
+# Source files read by the dashboard features
+DATA_DIR = "data"
+TEMPERATURE_FILE = os.path.join(DATA_DIR, "global_temperature.csv")
+CO2_FILE = os.path.join(DATA_DIR, "co2_emissions.csv")
+GDP_FILE = os.path.join(DATA_DIR, "archive (3)", "gdp.csv")
+
+# Seconds between checks of DATA_DIR for changed files (0 disables the refresher)
+REFRESH_INTERVAL = float(os.environ.get("DATA_REFRESH_INTERVAL", 30))
+
+# Directory of the lock serializing the refresh hooks across processes (model_store's MODEL_STORE_DIR)
+REFRESH_LOCK_DIR = os.environ.get("MODEL_STORE_DIR", "model_store")
+
+
+def data_dir_signature():
+    """
+    Returns the (path, mtime, size) of every CSV under DATA_DIR, used to detect changed files cheaply.
+    """
+    signature = []
+    for root, _, files in os.walk(DATA_DIR):
+        for name in sorted(files):
+            if name.endswith(".csv"):
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(signature))
+
+
+class Datasets:
+    """
+    A snapshot of every CSV the dashboard reads, plus the derived frames shared by the features.
+
+    The frames are shared between callbacks (and, with a preloaded server, between forked workers),
+    so callers must treat them as read-only and copy before modifying. Callbacks should fetch the
+    snapshot once with get_datasets() and use it throughout, so a refresh never mixes two versions.
+    """
+
+    def __init__(self):
+        self._frames = {}
+        self._digests = {}
+        self.signature = data_dir_signature()
+        for path in (TEMPERATURE_FILE, CO2_FILE, GDP_FILE):
+            self.read_csv(path)
+
+        # Content hash of the source files, exposed to the caching layers
+        version = hashlib.sha256()
+        for key in sorted(self._digests):
+            version.update(key.encode("utf-8"))
+            version.update(self._digests[key].encode("utf-8"))
+        self.version = version.hexdigest()[:16]
+
+        # Derived frames used by more than one callback
+        self.temperature_pivot = self.temperature.pivot(index="Year", columns="Month", values="Monthly Anomaly")
+        self.temperature_yearly = self.temperature.groupby("Year")["Monthly Anomaly"].mean().reset_index()
+        self.co2_by_country = (
+            self.co2.groupby(["country_code", "country_name", "year"])["value"].mean().reset_index()
+        )
+        self.co2_countries = list(self.co2_by_country.groupby(["country_code", "country_name"]).size().index)
+
+    def read_csv(self, path):
+        # Read each file only once per snapshot, whichever module asks for it first
+        key = os.path.normpath(path)
+        if key not in self._frames:
+            with open(path, "rb") as csv_file:
+                content = csv_file.read()
+            self._digests[key] = hashlib.sha256(content).hexdigest()
+            self._frames[key] = pd.read_csv(io.BytesIO(content))
+        return self._frames[key]
+
+    @property
+    def temperature(self):
+        return self.read_csv(TEMPERATURE_FILE)
+
+    @property
+    def co2(self):
+        return self.read_csv(CO2_FILE)
+
+    @property
+    def gdp(self):
+        return self.read_csv(GDP_FILE)
+
+
+_datasets = None
+_datasets_lock = threading.Lock()
+_refresh_hooks = []
+_refresher = None
+
+
+def get_datasets():
+    """
+    Returns the current Datasets snapshot, loading it on first use.
+    """
+    global _datasets
+    if _datasets is None:
+        with _datasets_lock:
+            if _datasets is None:
+                _datasets = Datasets()
+    return _datasets
+
+
+def register_refresh_hook(hook):
+    """
+    Registers hook(datasets), called in the refresher thread after a new snapshot is swapped in,
+    so caches can be rebuilt off the request path.
+    """
+    _refresh_hooks.append(hook)
+
+
+def _run_hooks(snapshot):
+    for hook in _refresh_hooks:
+        try:
+            hook(snapshot)
+        except Exception as exc:
+            print(f"Data refresh hook {getattr(hook, '__name__', hook)} failed: {exc}")
+
+
+def _run_refresh_hooks(snapshot):
+    # Hooks run under an exclusive lock shared by all processes using the model store: the first
+    # worker fits and stores the models, the others wait and then only load them from the store.
+    # The lock lives next to the models because DATA_DIR may be mounted read-only.
+    try:
+        os.makedirs(REFRESH_LOCK_DIR, exist_ok=True)
+        lock_file = open(os.path.join(REFRESH_LOCK_DIR, ".refresh.lock"), "a")
+    except OSError as exc:
+        # Without the lock every worker may fit the models itself, which is slower but still correct
+        print(f"Could not open the refresh lock, running the hooks unlocked: {exc}")
+        _run_hooks(snapshot)
+        return
+
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            _run_hooks(snapshot)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def refresh_datasets():
+    """
+    Re-ingests the data directory if any CSV changed and swaps in the new snapshot.
+
+    Returns True when a new snapshot was installed.
+    """
+    global _datasets
+    current = get_datasets()
+    if data_dir_signature() == current.signature:
+        return False
+
+    # Build the whole snapshot before publishing it; callbacks keep serving the old one meanwhile
+    snapshot = Datasets()
+    with _datasets_lock:
+        if snapshot.version == _datasets.version:
+            # Touched but unchanged files: keep the old frames, remember the new signature
+            _datasets.signature = snapshot.signature
+            return False
+        _datasets = snapshot
+    print(f"Loaded data snapshot {snapshot.version}")
+
+    _run_refresh_hooks(snapshot)
+    return True
+
+
+def _refresh_loop(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            refresh_datasets()
+        except Exception as exc:  # A half-written file should not kill the refresher, retry next poll
+            print(f"Data refresh failed, keeping snapshot {get_datasets().version}: {exc}")
+
+
+def start_refresher(interval=REFRESH_INTERVAL):
+    """
+    Starts the background thread polling DATA_DIR for changes (once per process).
+    """
+    global _refresher
+    if interval <= 0 or (_refresher is not None and _refresher.is_alive()):
+        return
+    get_datasets()
+    _refresher = threading.Thread(target=_refresh_loop, args=(interval,), name="data-refresher", daemon=True)
+    _refresher.start()
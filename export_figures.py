@@ -0,0 +1,197 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from datasets import CO2_FILE, GDP_FILE, get_datasets
+from co2_predictive_modeling import DEFAULT_YEAR
+from gdp_co2 import get_gdp_co2_predictive_modeling_layout
+from headless import collect_callbacks, find_figure
+from model_store import data_hash
+
+MANIFEST_NAME = "manifest.json"
+
+# Modules whose code shapes the exported figures; editing any of them re-renders everything
+FIGURE_MODULES = [
+    "heatmap.py", "line_chart.py", "choropleth.py", "predictive_modeling.py",
+    "co2_predictive_modeling.py", "gdp_co2.py", "figure_utils.py", "forecast_bands.py",
+]
+
+
+def code_hash():
+    digest = hashlib.sha256()
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in FIGURE_MODULES:
+        with open(os.path.join(base_dir, name), "rb") as module_file:
+            digest.update(module_file.read())
+    return digest.hexdigest()
+
+
+def build_tasks(uncertainty_mode):
+    """
+    Lists every figure of the dashboard as (output name, graph id, callback arguments, input frames).
+
+    The input frames are hashed to decide whether a figure needs re-rendering.
+    """
+    datasets = get_datasets()
+    temperature = datasets.temperature
+    co2 = datasets.co2
+    co2_by_country = datasets.co2_by_country
+
+    first_year, last_year = int(temperature["Year"].min()), int(temperature["Year"].max())
+    tasks = [
+        ("heatmap", "climate-graph", ([first_year, last_year], "thermal"), [datasets.temperature_pivot]),
+        ("line_chart", "line-chart-graph", ([first_year, last_year], "solid"), [temperature]),
+        ("temperature_forecast", "predictive-model-graph",
+         (int(datasets.temperature_yearly["Year"].max()) + 10, uncertainty_mode), [datasets.temperature_yearly]),
+        ("gdp_co2", "gdp-co2-plot", None, [co2, datasets.gdp]),
+    ]
+
+    # One choropleth per decade
+    first_co2_year, last_co2_year = int(co2["year"].min()), int(co2["year"].max())
+    for decade in range(first_co2_year - first_co2_year % 10, last_co2_year + 1, 10):
+        year_range = [max(decade, first_co2_year), min(decade + 9, last_co2_year)]
+        decade_data = co2[(co2["year"] >= year_range[0]) & (co2["year"] <= year_range[1])].reset_index(drop=True)
+        tasks.append((f"choropleth/{decade}s", "choropleth-map", (year_range,), [decade_data]))
+
+    # One CO2 forecast per country code (a renamed country, e.g. TUR, is listed once per name)
+    for code in dict(datasets.co2_countries):
+        # Reset the index so rows added for other countries do not change this country's hash
+        country_data = co2_by_country[co2_by_country["country_code"] == code].reset_index(drop=True)
+        tasks.append((f"co2_forecast/{code}", "co2-predictive-model-graph",
+                      (code, DEFAULT_YEAR, uncertainty_mode), [country_data]))
+    return tasks
+
+
+def input_hash(graph_id, args, frames, code_digest):
+    payload = {
+        "graph": graph_id,
+        "args": args,
+        "data": [data_hash(frame) for frame in frames],
+        "code": code_digest,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+_callbacks = None
+
+
+def _init_worker():
+    # Each worker registers the callbacks once and reuses them for all its figures
+    global _callbacks
+    _callbacks = collect_callbacks()
+
+
+def render_figure(name, graph_id, args, out_dir, formats):
+    """
+    Builds one figure without a server and writes it in every requested format.
+
+    Returns the list of written files, relative to out_dir.
+    """
+    if args is None:
+        figure = find_figure(get_gdp_co2_predictive_modeling_layout(CO2_FILE, GDP_FILE), graph_id)
+    else:
+        figure = _callbacks[graph_id](*args)
+
+    written = []
+    base_path = os.path.join(out_dir, name)
+    os.makedirs(os.path.dirname(base_path), exist_ok=True)
+    for fmt in formats:
+        path = f"{base_path}.{fmt}"
+        if fmt == "html":
+            figure.write_html(path, include_plotlyjs="cdn")
+        elif fmt == "json":
+            with open(path, "w") as json_file:
+                json_file.write(figure.to_json())
+        elif fmt == "png":
+            figure.write_image(path)  # Requires kaleido
+        written.append(os.path.relpath(path, out_dir))
+    return written
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME)) as manifest_file:
+            return json.load(manifest_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(out_dir, manifest):
+    # Write then rename, so an interrupted run never leaves a truncated manifest
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def is_current(entry, digest, formats, out_dir):
+    if entry is None or entry.get("input_hash") != digest:
+        return False
+    files = entry.get("files", [])
+    rendered_formats = {os.path.splitext(path)[1][1:] for path in files}
+    return set(formats) <= rendered_formats and all(os.path.exists(os.path.join(out_dir, path)) for path in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every dashboard figure to static files, without a server.")
+    parser.add_argument("--out", default="exports", help="Output directory")
+    parser.add_argument("--formats", default="html,json", help="Comma-separated list of html, json, png")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--uncertainty", choices=["interval", "fan"], default="interval",
+                        help="Uncertainty display for the forecast figures")
+    parser.add_argument("--only", default=None, help="Only export figures whose name starts with this prefix")
+    parser.add_argument("--force", action="store_true", help="Re-render figures even if their inputs are unchanged")
+    args = parser.parse_args()
+
+    formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    unknown = set(formats) - {"html", "json", "png"}
+    if unknown:
+        parser.error(f"Unknown format(s): {', '.join(sorted(unknown))}")
+
+    os.makedirs(args.out, exist_ok=True)
+    manifest = load_manifest(args.out)
+    code_digest = code_hash()
+
+    # Decide which figures are stale before starting any worker
+    pending = []
+    skipped = 0
+    for name, graph_id, cb_args, frames in build_tasks(args.uncertainty):
+        if args.only and not name.startswith(args.only):
+            continue
+        digest = input_hash(graph_id, cb_args, frames, code_digest)
+        if not args.force and is_current(manifest.get(name), digest, formats, args.out):
+            skipped += 1
+            continue
+        pending.append((name, graph_id, cb_args, digest))
+
+    print(f"{len(pending)} figure(s) to render, {skipped} unchanged")
+    start = time.perf_counter()
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(render_figure, name, graph_id, cb_args, args.out, formats): (name, digest)
+            for name, graph_id, cb_args, digest in pending
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            name, digest = futures[future]
+            try:
+                files = future.result()
+            except Exception as exc:
+                failed += 1
+                print(f"[{done}/{len(futures)}] {name} failed: {exc}")
+                continue
+            manifest[name] = {"input_hash": digest, "files": files, "rendered": time.time()}
+            print(f"[{done}/{len(futures)}] {name}")
+            # Save as we go, so an interrupted run keeps the figures it finished
+            if done % 20 == 0:
+                save_manifest(args.out, manifest)
+
+    save_manifest(args.out, manifest)
+    print(f"Done in {time.perf_counter() - start:.1f}s ({failed} failed)")
+
+
+if __name__ == "__main__":
+    main()
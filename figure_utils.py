@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import plotly
+
+# Set DASH_OPTIMIZE_FIGURES=0 to send figures exactly as Plotly builds them
+OPTIMIZE_FIGURES = os.environ.get("DASH_OPTIMIZE_FIGURES", "1") == "1"
+
+# Trace attributes holding per-point numeric data
+ARRAY_ATTRIBUTES = ("x", "y", "z")
+
+# Plotly >= 6 serializes numpy arrays as base64 typed arrays instead of JSON number lists
+TYPED_ARRAYS = int(plotly.__version__.split(".")[0]) >= 6
+
+
+def _compact_array(values, decimals):
+    arr = np.asarray(values)
+    if arr.dtype.kind not in "fiu" or arr.size == 0:
+        return None  # Strings, dates and empty arrays are left alone
+
+    if arr.dtype.kind == "f":
+        arr = np.round(arr, decimals)
+        if decimals <= 0 and np.isfinite(arr).all():
+            arr = arr.astype(np.int64)
+
+    if arr.dtype.kind in "iu":
+        # Integers are short as text and compact as typed arrays
+        if TYPED_ARRAYS and np.abs(arr).max() < 2 ** 31:
+            return arr.astype(np.int32)
+        return arr.tolist()
+
+    if TYPED_ARRAYS:
+        # float32 only when it still holds every value at display precision
+        arr32 = arr.astype(np.float32)
+        if np.allclose(arr32, arr, rtol=0, atol=0.5 * 10.0 ** -decimals, equal_nan=True):
+            return arr32
+    # Rounded float64 lists serialize to their short decimal form
+    return arr.tolist()
+
+
+def optimize_figure(fig, decimals=3):
+    """
+    Shrinks a figure's JSON before it is sent to the browser.
+
+    Coordinates are rounded to display precision and, when Plotly supports it, encoded as
+    compact typed arrays. Repeated strings are left to response compression.
+
+    Parameters:
+    - fig: Plotly figure to optimize in place
+    - decimals: Decimal places to keep, either one value or a dict per attribute ("x", "y", "z")
+    """
+    if not OPTIMIZE_FIGURES:
+        return fig
+
+    for trace in fig.data:
+        for attr in ARRAY_ATTRIBUTES:
+            values = getattr(trace, attr, None)
+            if values is None:
+                continue
+            attr_decimals = decimals.get(attr, 3) if isinstance(decimals, dict) else decimals
+            compacted = _compact_array(values, attr_decimals)
+            if compacted is not None:
+                trace[attr] = compacted
+    return fig
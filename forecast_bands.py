@@ -0,0 +1,74 @@
+import numpy as np
+import plotly.graph_objects as go
+from scipy.stats import norm
+
+# Coverage of the bands drawn in fan chart mode
+FAN_LEVELS = (0.50, 0.80, 0.95)
+
+# Options shared by the uncertainty mode selectors of the forecast features
+UNCERTAINTY_MODES = [
+    {"label": "Confidence Interval", "value": "interval"},
+    {"label": "Fan Chart (50/80/95%)", "value": "fan"},
+]
+
+
+def forecast_quantile_bands(forecast, levels):
+    """
+    Computes the lower and upper bounds of several central prediction bands at once.
+
+    SARIMAX forecasts are Gaussian, so every quantile follows from the predicted mean and
+    standard error the state-space filter already produced; no refit or path simulation is needed.
+
+    Returns:
+    - Lower bounds, array of shape (len(levels), steps)
+    - Upper bounds, array of shape (len(levels), steps)
+    """
+    mean = np.asarray(forecast.predicted_mean, dtype=float)
+    se = np.asarray(forecast.se_mean, dtype=float)
+    z = norm.ppf(0.5 + np.asarray(levels, dtype=float) / 2)
+
+    spread = z[:, None] * se[None, :]
+    return mean[None, :] - spread, mean[None, :] + spread
+
+
+def band_polygon(x, lower, upper):
+    # Closed outline of a band: along the lower bound, then back along the upper bound
+    x = np.asarray(x)
+    return np.concatenate([x, x[::-1]]), np.concatenate([lower, upper[::-1]])
+
+
+def add_band_traces(fig, x, forecast, levels, names, color=(99, 110, 250)):
+    """
+    Adds one filled trace per band to the figure, widest first so narrower bands stay visible.
+    """
+    lower, upper = forecast_quantile_bands(forecast, levels)
+    for i in np.argsort(levels)[::-1]:
+        band_x, band_y = band_polygon(x, lower[i], upper[i])
+        # Narrower (more likely) bands are drawn more opaque
+        opacity = 0.15 + 0.25 * (1 - levels[i])
+        fig.add_trace(go.Scatter(
+            x=band_x,
+            y=band_y,
+            fill="toself",
+            fillcolor=f"rgba({color[0]},{color[1]},{color[2]},{opacity:.2f})",
+            name=names[i],
+            mode="lines",
+            line_color="rgba(0,0,0,0)",
+        ))
+
+
+def add_uncertainty_traces(fig, x, forecast, mode, interval_level):
+    """
+    Adds either the single confidence interval or the fan chart bands for a forecast.
+
+    Parameters:
+    - fig: Figure the traces are added to
+    - x: Forecast years
+    - forecast: statsmodels PredictionResults from get_forecast
+    - mode: "interval" or "fan"
+    - interval_level: Coverage of the single interval (e.g. 0.95)
+    """
+    if mode == "fan":
+        add_band_traces(fig, x, forecast, FAN_LEVELS, [f"{level:.0%} Interval" for level in FAN_LEVELS])
+    else:
+        add_band_traces(fig, x, forecast, (interval_level,), ["Confidence Interval"])
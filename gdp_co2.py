@@ -7,18 +7,23 @@ from sklearn.metrics import mean_squared_error
 import plotly.graph_objects as go
 from scipy.stats import pearsonr  # Import pearsonr to calculate the correlation coefficient
 
+import figure_utils
+from datasets import get_datasets
+from figure_utils import optimize_figure
+from model_store import load_or_fit
+
 
 # Load CO2 Emissions Data
-def load_co2_data(co2_file):
-    co2_df = pd.read_csv(co2_file)
+def load_co2_data(co2_file, datasets=None):
+    co2_df = (datasets or get_datasets()).read_csv(co2_file)
     co2_df = co2_df[['country_name', 'year', 'value']]
     co2_df = co2_df.rename(columns={'value': 'co2_emissions'})
     return co2_df
 
 
 # Load GDP Data
-def load_gdp_data(gdp_file):
-    gdp_df = pd.read_csv(gdp_file)
+def load_gdp_data(gdp_file, datasets=None):
+    gdp_df = (datasets or get_datasets()).read_csv(gdp_file)
     if 'Unnamed: 65' in gdp_df.columns:
         gdp_df = gdp_df.drop(columns=['Unnamed: 65'])
     gdp_df = gdp_df.melt(id_vars=['country_name', 'country_code'],
@@ -40,8 +45,19 @@ def train_model(merged_df):
     X = merged_df[['gdp']]
     y = merged_df['co2_emissions']
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    model = LinearRegression()
-    model.fit(X_train, y_train)
+
+    def fit():
+        model = LinearRegression()
+        model.fit(X_train, y_train)
+        return model
+
+    # Reuse the persisted model when the training data has not changed
+    model = load_or_fit(
+        "gdp_co2_linear",
+        {"test_size": 0.2, "random_state": 42},
+        merged_df[['gdp', 'co2_emissions']],
+        fit,
+    )
     y_pred = model.predict(X_test)
     mse = mean_squared_error(y_test, y_pred)
     print(f"Mean Squared Error: {mse}")
@@ -67,9 +83,15 @@ def plot_results(X_test, y_test, y_pred, merged_df):
         hoverinfo='text+x+y'
     ))
 
+    x_values = X_test.values.flatten()
+    line_x, line_y = x_values, y_pred
+    if figure_utils.OPTIMIZE_FIGURES:
+        # A straight line only needs its two endpoints
+        endpoints = [x_values.argmin(), x_values.argmax()]
+        line_x, line_y = x_values[endpoints], y_pred[endpoints]
     fig.add_trace(go.Scatter(
-        x=X_test.values.flatten(),
-        y=y_pred,
+        x=line_x,
+        y=line_y,
         mode='lines',
         name='Linear Regression Line',
         line=dict(color='red', width=2),
@@ -100,16 +122,34 @@ def plot_results(X_test, y_test, y_pred, merged_df):
         font=dict(color="black")  # Font color to ensure text is readable
     )
 
-    return fig
+    return optimize_figure(fig, decimals={'x': 0, 'y': 1})
 
 
-# Function for Dash Layout
-def get_gdp_co2_predictive_modeling_layout(co2_file, gdp_file):
-    co2_df = load_co2_data(co2_file)
-    gdp_df = load_gdp_data(gdp_file)
+# Merged data, model results and correlation per (co2_file, gdp_file), for the current data snapshot only
+_analysis_cache = {}
+
+
+def analyze(co2_file, gdp_file):
+    # Merge, train and correlate once per data snapshot instead of on every tab switch.
+    # The snapshot is fetched once, so a refresh in between cannot mix two versions.
+    snapshot = get_datasets()
+    cached = _analysis_cache.get((co2_file, gdp_file))
+    if cached is not None and cached[0] == snapshot.version:
+        return cached[1]
+
+    co2_df = load_co2_data(co2_file, snapshot)
+    gdp_df = load_gdp_data(gdp_file, snapshot)
     merged_df = merge_data(co2_df, gdp_df)
     model, X_test, y_test, y_pred, merged_df = train_model(merged_df)
     correlation = calculate_correlation(merged_df)  # Calculate correlation
+    analysis = (X_test, y_test, y_pred, merged_df, correlation)
+    _analysis_cache[(co2_file, gdp_file)] = (snapshot.version, analysis)
+    return analysis
+
+
+# Function for Dash Layout
+def get_gdp_co2_predictive_modeling_layout(co2_file, gdp_file):
+    X_test, y_test, y_pred, merged_df, correlation = analyze(co2_file, gdp_file)
     fig = plot_results(X_test, y_test, y_pred, merged_df)
 
     layout = html.Div([
@@ -6,6 +6,9 @@ from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 from sklearn.impute import SimpleImputer
 
+from datasets import get_datasets
+from model_store import load_or_fit
+
 
 def evaluate_model():
     """
@@ -16,8 +19,8 @@ def evaluate_model():
     - R-squared Score
     - Feature Coefficients Dictionary
     """
-    # Load the dataset
-    df = pd.read_csv('data/global_temperature.csv')
+    # Load the dataset (shared, read-only)
+    df = get_datasets().temperature
 
     # Handle missing values using imputation
     imputer = SimpleImputer(strategy='mean')
@@ -42,52 +45,67 @@ def evaluate_model():
     X = df_imputed[features]
     y = df_imputed['Annual Anomaly']
 
-    # Initialize TimeSeriesSplit
-    tscv = TimeSeriesSplit(n_splits=5)
-
-    # Prepare lists to store performance metrics
-    mse_scores = []
-    r2_scores = []
-    mae_scores = []
-
-    # Standardization scaler
-    scaler = StandardScaler()
-
-    # Perform cross-validation
-    for train_index, test_index in tscv.split(X):
-        # Split data while maintaining time order
-        X_train, X_test = X.iloc[train_index], X.iloc[test_index]
-        y_train, y_test = y.iloc[train_index], y.iloc[test_index]
-
-        # Scale the features
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-
-        # Train the model
-        model = LinearRegression()
-        model.fit(X_train_scaled, y_train)
-
-        # Predict and evaluate
-        y_pred = model.predict(X_test_scaled)
-
-        # Calculate metrics
-        mse = mean_squared_error(y_test, y_pred)
-        r2 = r2_score(y_test, y_pred)
-        mae = mean_absolute_error(y_test, y_pred)
-
-        # Store metrics
-        mse_scores.append(mse)
-        r2_scores.append(r2)
-        mae_scores.append(mae)
-
-    # Calculate average performance metrics
-    mean_mse = np.mean(mse_scores)
-    mean_r2 = np.mean(r2_scores)
-
-    # Final model for coefficient analysis
-    X_scaled = scaler.fit_transform(X)
-    final_model = LinearRegression()
-    final_model.fit(X_scaled, y)
+    def fit():
+        # Initialize TimeSeriesSplit
+        tscv = TimeSeriesSplit(n_splits=5)
+
+        # Prepare lists to store performance metrics
+        mse_scores = []
+        r2_scores = []
+        mae_scores = []
+
+        # Standardization scaler
+        scaler = StandardScaler()
+
+        # Perform cross-validation
+        for train_index, test_index in tscv.split(X):
+            # Split data while maintaining time order
+            X_train, X_test = X.iloc[train_index], X.iloc[test_index]
+            y_train, y_test = y.iloc[train_index], y.iloc[test_index]
+
+            # Scale the features
+            X_train_scaled = scaler.fit_transform(X_train)
+            X_test_scaled = scaler.transform(X_test)
+
+            # Train the model
+            model = LinearRegression()
+            model.fit(X_train_scaled, y_train)
+
+            # Predict and evaluate
+            y_pred = model.predict(X_test_scaled)
+
+            # Calculate metrics
+            mse = mean_squared_error(y_test, y_pred)
+            r2 = r2_score(y_test, y_pred)
+            mae = mean_absolute_error(y_test, y_pred)
+
+            # Store metrics
+            mse_scores.append(mse)
+            r2_scores.append(r2)
+            mae_scores.append(mae)
+
+        # Final model for coefficient analysis
+        X_scaled = scaler.fit_transform(X)
+        final_model = LinearRegression()
+        final_model.fit(X_scaled, y)
+
+        return {
+            "mean_mse": np.mean(mse_scores),
+            "mean_r2": np.mean(r2_scores),
+            "final_model": final_model,
+            "scaler": scaler,
+        }
+
+    # Load the cross-validation results, final model and scaler from the model store when possible
+    evaluation = load_or_fit(
+        "global_temp_linear",
+        {"n_splits": 5, "features": features, "imputer": "mean"},
+        df,
+        fit,
+    )
+    mean_mse = evaluation["mean_mse"]
+    mean_r2 = evaluation["mean_r2"]
+    final_model = evaluation["final_model"]
 
     # Create coefficients dictionary
     coefficients = dict(zip(features, final_model.coef_))
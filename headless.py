@@ -0,0 +1,55 @@
+from dash import dcc
+
+from heatmap import register_heatmap_callbacks
+from line_chart import register_line_chart_callbacks
+from choropleth import register_choropleth_callbacks
+from predictive_modeling import register_predictive_modeling_callbacks
+from co2_predictive_modeling import register_co2_predictive_modeling_callbacks
+
+
+class CallbackRecorder:
+    """
+    Stands in for the Dash app when registering callbacks, so figures can be built without a server.
+    """
+
+    def __init__(self):
+        self.callbacks = {}
+
+    def callback(self, output, *args, **kwargs):
+        def decorator(func):
+            # Keyed by the id of the component the callback updates
+            self.callbacks[output.component_id] = func
+            return func
+        return decorator
+
+
+def collect_callbacks():
+    """
+    Returns the figure callbacks of every feature, keyed by their output graph id.
+    """
+    recorder = CallbackRecorder()
+    register_heatmap_callbacks(recorder)
+    register_line_chart_callbacks(recorder)
+    register_choropleth_callbacks(recorder)
+    register_predictive_modeling_callbacks(recorder)
+    register_co2_predictive_modeling_callbacks(recorder)
+    return recorder.callbacks
+
+
+def find_figure(component, graph_id):
+    """
+    Returns the figure of the dcc.Graph with the given id inside a layout, or None.
+    """
+    if isinstance(component, dcc.Graph) and getattr(component, "id", None) == graph_id:
+        return component.figure
+
+    children = getattr(component, "children", None)
+    if children is None:
+        return None
+    if not isinstance(children, (list, tuple)):
+        children = [children]
+    for child in children:
+        figure = find_figure(child, graph_id)
+        if figure is not None:
+            return figure
+    return None
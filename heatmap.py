@@ -1,12 +1,9 @@
-import pandas as pd
 import plotly.express as px
 from dash import dcc, html, Input, Output
 
-# Load the dataset
-df = pd.read_csv("data/global_temperature.csv")
-
-# Pivot the data for the heatmap
-heatmap_data = df.pivot(index="Year", columns="Month", values="Monthly Anomaly")
+from datasets import get_datasets
+from figure_utils import optimize_figure
+from profiling import profiled
 
 # List of available color scales for the heatmap
 color_scales = [
@@ -17,6 +14,9 @@ color_scales = [
 
 # Layout for the heatmap feature
 def get_heatmap_layout():
+    # Pivoted data for the heatmap, from the current data snapshot
+    heatmap_data = get_datasets().temperature_pivot
+
     return html.Div([
         html.H2("Heatmap: Temperature Anomalies"),
 
@@ -52,8 +52,10 @@ def register_heatmap_callbacks(app):
         [Input("year-slider", "value"),
          Input("color-theme-selector", "value")]
     )
+    @profiled("heatmap")
     def update_graph(year_range, selected_color_theme):
         # Filter heatmap data based on selected year range
+        heatmap_data = get_datasets().temperature_pivot
         filtered_data = heatmap_data.loc[year_range[0]:year_range[1]]
 
         # Create heatmap with selected color theme
@@ -72,4 +74,4 @@ def register_heatmap_callbacks(app):
             xaxis=dict(tickmode="array", tickvals=list(range(12)), ticktext=[str(i + 1) for i in range(12)]),
             yaxis=dict(scaleanchor="x"),
         )
-        return fig
+        return optimize_figure(fig, decimals=3)
@@ -1,12 +1,15 @@
-import pandas as pd
 import plotly.express as px
 from dash import dcc, html, Input, Output
 
-# Load the dataset
-df = pd.read_csv("data/global_temperature.csv")
+from datasets import get_datasets
+from figure_utils import optimize_figure
+from profiling import profiled
 
 # Layout for the line chart feature
 def get_line_chart_layout():
+    # Load the dataset from the current data snapshot
+    df = get_datasets().temperature
+
     return html.Div([
         html.H2("Line Chart: Global Temperature Trends"),
 
@@ -45,8 +48,10 @@ def register_line_chart_callbacks(app):
         [Input("line-year-slider", "value"),
          Input("line-style-selector", "value")]
     )
+    @profiled("line_chart")
     def update_line_chart(year_range, selected_line_style):
         # Filter data based on selected year range
+        df = get_datasets().temperature
         filtered_data = df[(df["Year"] >= year_range[0]) & (df["Year"] <= year_range[1])]
 
         # Aggregate data by year
@@ -62,4 +67,4 @@ def register_line_chart_callbacks(app):
         )
         # Customize line style
         fig.update_traces(line=dict(dash=selected_line_style))
-        return fig
+        return optimize_figure(fig, decimals=3)
@@ -0,0 +1,331 @@
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+# Inputs of every callback, in the order they are declared: output id -> (output property, [(id, property)])
+CALLBACKS = {
+    "feature-content": ("children", [("feature-selector", "value")]),
+    "climate-graph": ("figure", [("year-slider", "value"), ("color-theme-selector", "value")]),
+    "line-chart-graph": ("figure", [("line-year-slider", "value"), ("line-style-selector", "value")]),
+    "choropleth-map": ("figure", [("choropleth-year-slider", "value")]),
+    "predictive-model-graph": ("figure", [("forecast-year-input", "value"),
+                                          ("temperature-uncertainty-mode", "value")]),
+    "co2-predictive-model-graph": ("figure", [("country-dropdown", "value"), ("forecast-year-input", "value"),
+                                              ("co2-uncertainty-mode", "value")]),
+    "country-info": ("children", [("gdp-co2-plot", "hoverData")]),
+}
+
+# How often simulated users open each tab
+TAB_WEIGHTS = {
+    "heatmap": 3,
+    "line_chart": 2,
+    "choropleth": 3,
+    "predictive_modeling": 2,
+    "co2_predictive_modeling": 4,
+    "gdp_co2_correlation": 1,
+}
+
+COLOR_THEMES = ["thermal", "viridis", "cividis", "magma", "plasma", "inferno", "blues", "greens", "reds", "purples"]
+
+
+def dash_request(output_id, values, changed):
+    """
+    Builds the body the browser posts to _dash-update-component for one callback.
+
+    Parameters:
+    - output_id: Id of the component the callback updates
+    - values: Values of the callback inputs, in declaration order
+    - changed: Index of the input that triggered the callback
+    """
+    output_prop, inputs = CALLBACKS[output_id]
+    return {
+        "output": f"{output_id}.{output_prop}",
+        "outputs": {"id": output_id, "property": output_prop},
+        "inputs": [
+            {"id": component_id, "property": prop, "value": value}
+            for (component_id, prop), value in zip(inputs, values)
+        ],
+        "changedPropIds": ["{}.{}".format(*inputs[changed])],
+        "state": [],
+    }
+
+
+class TraceBuilder:
+    """
+    Generates realistic interaction traces: a tab switch followed by the requests that tab's controls fire.
+    """
+
+    def __init__(self, rng, countries, temperature_years, co2_years):
+        self.rng = rng
+        self.countries = countries
+        self.temperature_years = temperature_years
+        self.co2_years = co2_years
+
+    def year_range(self, bounds):
+        start = self.rng.randint(bounds[0], bounds[1])
+        return [start, self.rng.randint(start, bounds[1])]
+
+    def typed_year(self):
+        # dcc.Input fires on every keystroke, so typing "2075" sends 2, 20, 207, 2075
+        year = str(self.rng.randint(2025, 2100))
+        return [int(year[:i]) for i in range(1, len(year) + 1)]
+
+    def session(self):
+        tab = self.rng.choices(list(TAB_WEIGHTS), weights=list(TAB_WEIGHTS.values()))[0]
+        rng = self.rng
+        requests = [dash_request("feature-content", [tab], 0)]
+
+        if tab == "heatmap":
+            theme, years = "thermal", list(self.temperature_years)
+            requests.append(dash_request("climate-graph", [years, theme], 0))
+            for _ in range(rng.randint(1, 5)):
+                if rng.random() < 0.7:
+                    years = self.year_range(self.temperature_years)
+                    requests.append(dash_request("climate-graph", [years, theme], 0))
+                else:
+                    theme = rng.choice(COLOR_THEMES)
+                    requests.append(dash_request("climate-graph", [years, theme], 1))
+
+        elif tab == "line_chart":
+            style, years = "solid", list(self.temperature_years)
+            requests.append(dash_request("line-chart-graph", [years, style], 0))
+            for _ in range(rng.randint(1, 5)):
+                if rng.random() < 0.7:
+                    years = self.year_range(self.temperature_years)
+                    requests.append(dash_request("line-chart-graph", [years, style], 0))
+                else:
+                    style = rng.choice(["solid", "dash", "dot"])
+                    requests.append(dash_request("line-chart-graph", [years, style], 1))
+
+        elif tab == "choropleth":
+            requests.append(dash_request("choropleth-map", [list(self.co2_years)], 0))
+            for _ in range(rng.randint(1, 5)):
+                requests.append(dash_request("choropleth-map", [self.year_range(self.co2_years)], 0))
+
+        elif tab == "predictive_modeling":
+            mode = "interval"
+            requests.append(dash_request("predictive-model-graph", [self.temperature_years[1] + 10, mode], 0))
+            for _ in range(rng.randint(1, 3)):
+                for year in self.typed_year():
+                    requests.append(dash_request("predictive-model-graph", [year, mode], 0))
+                if rng.random() < 0.3:
+                    mode = "fan" if mode == "interval" else "interval"
+                    requests.append(dash_request("predictive-model-graph", [year, mode], 1))
+
+        elif tab == "co2_predictive_modeling":
+            country, year, mode = "USA", 2033, "interval"
+            requests.append(dash_request("co2-predictive-model-graph", [country, year, mode], 0))
+            for _ in range(rng.randint(1, 4)):
+                if rng.random() < 0.6:
+                    country = rng.choice(self.countries)
+                    requests.append(dash_request("co2-predictive-model-graph", [country, year, mode], 0))
+                else:
+                    for year in self.typed_year():
+                        requests.append(dash_request("co2-predictive-model-graph", [country, year, mode], 1))
+
+        elif tab == "gdp_co2_correlation":
+            requests.append(dash_request("country-info", [None], 0))
+            for _ in range(rng.randint(1, 6)):
+                hover = {"points": [{"curveNumber": 0, "x": rng.uniform(1e9, 1e13),
+                                     "y": rng.uniform(1e3, 1e7), "text": rng.choice(self.countries)}]}
+                requests.append(dash_request("country-info", [hover], 0))
+
+        return tab, requests
+
+
+class Recorder:
+    """
+    Collects per-request results and samples how many requests are in flight.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.results = []
+        self.in_flight = 0
+        self.samples = []
+
+    def start(self):
+        with self.lock:
+            self.in_flight += 1
+
+    def finish(self, callback, latency, ok):
+        with self.lock:
+            self.in_flight -= 1
+            self.results.append((callback, latency, ok))
+
+    def sample(self):
+        with self.lock:
+            self.samples.append(self.in_flight)
+
+
+def post(url, body, timeout):
+    request = urllib.request.Request(
+        url + "/_dash-update-component",
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"},
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+        return 200 <= response.status < 300
+
+
+def run_user(url, builder, recorder, deadline, think_time, timeout):
+    while time.time() < deadline:
+        _, requests = builder.session()
+        for body in requests:
+            if time.time() >= deadline:
+                return
+            recorder.start()
+            start = time.perf_counter()
+            try:
+                ok = post(url, body, timeout)
+            except (urllib.error.URLError, OSError):
+                ok = False
+            recorder.finish(body["outputs"]["id"], time.perf_counter() - start, ok)
+            # Users pause between interactions
+            time.sleep(builder.rng.expovariate(1 / think_time) if think_time > 0 else 0)
+
+
+def percentile(values, q):
+    # Nearest-rank percentile of an already sorted list
+    index = max(0, min(len(values) - 1, math.ceil(q / 100 * len(values)) - 1))
+    return values[index]
+
+
+def worker_pids(server_pid):
+    # gunicorn workers are the children of the master process
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat_file:
+                fields = stat_file.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == server_pid:
+            pids.append(int(entry))
+    return pids
+
+
+def cpu_ticks(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as stat_file:
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return 0
+    return int(fields[11]) + int(fields[12])  # utime + stime
+
+
+def start_server(port, workers, startup_timeout):
+    process = subprocess.Popen(
+        [sys.executable, "serve.py", "--bind", f"127.0.0.1:{port}", "--workers", str(workers)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + startup_timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("The server exited during startup")
+        try:
+            urllib.request.urlopen(url + "/", timeout=5).read()
+            return process, url
+        except (urllib.error.URLError, OSError):
+            time.sleep(1)
+    process.terminate()
+    raise RuntimeError(f"The server did not answer within {startup_timeout}s")
+
+
+def report(recorder, duration, workers, worker_cpu):
+    results = recorder.results
+    total = len(results)
+    errors = sum(1 for _, _, ok in results if not ok)
+    print(f"\nRequests: {total}  errors: {errors}  throughput: {total / duration:.1f} req/s\n")
+
+    by_callback = defaultdict(list)
+    for callback, latency, ok in results:
+        if ok:
+            by_callback[callback].append(latency * 1000)
+
+    print(f"{'Callback':<28}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for callback in CALLBACKS:
+        latencies = sorted(by_callback.get(callback, []))
+        if not latencies:
+            continue
+        print(f"{callback:<28}{len(latencies):>8}{percentile(latencies, 50):>10.0f}{percentile(latencies, 95):>10.0f}"
+              f"{percentile(latencies, 99):>10.0f}{latencies[-1]:>10.0f}")
+
+    if recorder.samples and workers:
+        samples = recorder.samples
+        saturated = sum(1 for value in samples if value >= workers) / len(samples)
+        print(f"\nMean in-flight requests per worker: {sum(samples) / len(samples) / workers:.2f}")
+        print(f"Time with every worker busy: {saturated:.0%}")
+    if worker_cpu:
+        print("Worker CPU utilisation: " + ", ".join(f"{pid}: {share:.0%}" for pid, share in worker_cpu.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay simulated dashboard sessions against a local server.")
+    parser.add_argument("--url", default="http://127.0.0.1:8050", help="Server to test (ignored with --start)")
+    parser.add_argument("--start", action="store_true", help="Start serve.py on --port for the duration of the test")
+    parser.add_argument("--port", type=int, default=8051)
+    parser.add_argument("--workers", type=int, default=1, help="Workers of the server under test")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=60, help="Test length in seconds")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean pause between interactions in seconds")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from datasets import get_datasets
+
+    datasets = get_datasets()
+    countries = [code for code, _ in datasets.co2_countries]
+    temperature_years = (int(datasets.temperature["Year"].min()), int(datasets.temperature["Year"].max()))
+    co2_years = (int(datasets.co2["year"].min()), int(datasets.co2["year"].max()))
+
+    process, url = (None, args.url)
+    if args.start:
+        process, url = start_server(args.port, args.workers, startup_timeout=600)
+
+    try:
+        pids = worker_pids(process.pid) if process else []
+        ticks_before = {pid: cpu_ticks(pid) for pid in pids}
+
+        recorder = Recorder()
+        deadline = time.time() + args.duration
+        users = [
+            threading.Thread(target=run_user, daemon=True, args=(
+                url, TraceBuilder(random.Random(args.seed + i), countries, temperature_years, co2_years),
+                recorder, deadline, args.think_time, args.timeout,
+            ))
+            for i in range(args.users)
+        ]
+        start = time.time()
+        for user in users:
+            user.start()
+        while any(user.is_alive() for user in users):
+            recorder.sample()
+            time.sleep(0.1)
+        duration = time.time() - start
+
+        clock_ticks = os.sysconf("SC_CLK_TCK")
+        worker_cpu = {pid: (cpu_ticks(pid) - ticks) / clock_ticks / duration for pid, ticks in ticks_before.items()}
+        report(recorder, duration, args.workers, worker_cpu)
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
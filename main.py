@@ -1,27 +1,40 @@
+import os
+
 import dash
 from dash import dcc, html, Output, Input
 import dash_bootstrap_components as dbc
+from datasets import CO2_FILE, GDP_FILE, register_refresh_hook, start_refresher
 from global_temp_model import evaluate_model  # Import the evaluate_model function
 
 from heatmap import get_heatmap_layout, register_heatmap_callbacks
 from line_chart import get_line_chart_layout, register_line_chart_callbacks
 from choropleth import get_choropleth_layout, register_choropleth_callbacks
-from predictive_modeling import get_predictive_modeling_layout, register_predictive_modeling_callbacks
+from predictive_modeling import (
+    get_predictive_modeling_layout,
+    register_predictive_modeling_callbacks,
+    fit_temperature_sarima,
+)
 from co2_predictive_modeling import (
     get_co2_predictive_modeling_layout,
     register_co2_predictive_modeling_callbacks,
 )
+from backtesting import get_backtesting_layout, register_backtesting_callbacks
+from profile_viewer import get_profile_viewer_layout, register_profile_viewer_callbacks
+from profiling import PROFILE_ENABLED, profiled
 from gdp_co2 import (
     get_gdp_co2_predictive_modeling_layout,  # Assuming you created this layout function
     register_gdp_co2_predictive_modeling_callbacks  # Assuming you created the corresponding callbacks
 )
 
-# Initialize the Dash app
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+# Initialize the Dash app (compress=True gzip/brotli-encodes responses via flask-compress)
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], compress=True)
 
 # Suppress callback exceptions for dynamic layouts
 app.config.suppress_callback_exceptions = True
 
+# WSGI entry point for production servers (see serve.py)
+server = app.server
+
 # Define the layout for model evaluation (added to Line Chart)
 def get_model_evaluation_layout(mse, r2, coefficients):
     explanation = html.Div([
@@ -99,7 +112,11 @@ app.layout = dbc.Container([
                         {"label": "Global Temperature Predictive Modeling", "value": "predictive_modeling"},
                         {"label": "Co2 Emissions Predictive Modeling", "value": "co2_predictive_modeling"},
                         {"label": "GDP vs CO2 Correlation", "value": "gdp_co2_correlation"},
-                    ],
+                        {"label": "Forecast Backtesting", "value": "backtesting"},
+                    ] + (
+                        # The profile viewer is only offered when profiling is explicitly enabled
+                        [{"label": "Slow Callback Profiles", "value": "profile_viewer"}] if PROFILE_ENABLED else []
+                    ),
                     value="heatmap",  # Default value
                     clearable=False,
                     style={"width": "100%"}
@@ -117,6 +134,7 @@ app.layout = dbc.Container([
     Output("feature-content", "children"),
     [Input("feature-selector", "value")]
 )
+@profiled("feature_content")
 def display_feature(feature):
     if feature == "heatmap":
         return get_heatmap_layout()  # Load heatmap layout
@@ -134,7 +152,11 @@ def display_feature(feature):
     elif feature == "co2_predictive_modeling":
         return get_co2_predictive_modeling_layout()
     elif feature == "gdp_co2_correlation":  # When GDP vs CO2 is selected
-        return get_gdp_co2_predictive_modeling_layout("data/co2_emissions.csv", "data/archive (3)/gdp.csv")  # Show GDP vs CO2 layout
+        return get_gdp_co2_predictive_modeling_layout(CO2_FILE, GDP_FILE)  # Show GDP vs CO2 layout
+    elif feature == "backtesting":
+        return get_backtesting_layout()
+    elif feature == "profile_viewer" and PROFILE_ENABLED:
+        return get_profile_viewer_layout()
     return html.Div("Select a valid feature.")
 
 # Register callbacks for each feature
@@ -144,7 +166,18 @@ register_choropleth_callbacks(app)
 register_predictive_modeling_callbacks(app)
 register_co2_predictive_modeling_callbacks(app)  # Register CO2 Predictive Modeling Callbacks
 register_gdp_co2_predictive_modeling_callbacks(app)  # Register callbacks for GDP vs CO2
+register_backtesting_callbacks(app)
+if PROFILE_ENABLED:
+    register_profile_viewer_callbacks(app)
+
+# Rebuild the models used on page load whenever a new data snapshot is swapped in
+def warm_caches(datasets):
+    evaluate_model()
+    fit_temperature_sarima(datasets)
+
+register_refresh_hook(warm_caches)
 
-# Run the app
+# Run the development server (use serve.py for multi-worker deployments)
 if __name__ == "__main__":
-    app.run_server(debug=True)
+    start_refresher()
+    app.run_server(debug=os.environ.get("DASH_DEBUG", "1") == "1")
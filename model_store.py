@@ -0,0 +1,159 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import joblib
+import pandas as pd
+
+# Directory holding the persisted model artifacts (override with MODEL_STORE_DIR)
+MODEL_STORE_DIR = os.environ.get("MODEL_STORE_DIR", "model_store")
+
+# Artifacts already loaded in this process: model_type -> (key, artifact).
+# Filled before forking by serve.py's preload, so workers share the loaded models.
+_loaded = {}
+
+# Bump when the layout of stored artifacts changes so old files are ignored
+STORE_VERSION = 3
+
+
+def _library_versions():
+    # Pickled models are only safe to load with the library versions that wrote them
+    import sklearn
+    import statsmodels
+
+    return {
+        "sklearn": sklearn.__version__,
+        "statsmodels": statsmodels.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def data_hash(data):
+    """
+    Returns a stable content hash for a DataFrame or Series used to train a model.
+    """
+    # Content only: a country's series is a slice of a larger frame, and its index labels shift
+    # whenever rows are added to other countries, which must not invalidate its model
+    hashed = pd.util.hash_pandas_object(data, index=False).values
+    digest = hashlib.sha256(hashed.tobytes())
+    # Column names are part of the training data shape, include them as well
+    columns = list(data.columns) if isinstance(data, pd.DataFrame) else [data.name]
+    digest.update(json.dumps(columns, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def artifact_key(model_type, params, source_hash):
+    # Key = model type + hyperparameters + source data + store/library versions
+    payload = {
+        "store_version": STORE_VERSION,
+        "libraries": _library_versions(),
+        "model_type": model_type,
+        "params": params,
+        "data": source_hash,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def artifact_path(model_type, key):
+    return os.path.join(MODEL_STORE_DIR, f"{model_type}-{key[:24]}.joblib")
+
+
+def load_artifact(model_type, key):
+    """
+    Loads a stored artifact, returning None when it is missing or unreadable.
+    """
+    path = artifact_path(model_type, key)
+    try:
+        record = joblib.load(path)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:  # Truncated or incompatible file: treat as a miss and refit
+        print(f"Ignoring unreadable model artifact {path}: {exc}")
+        return None
+
+    if not isinstance(record, dict) or record.get("key") != key:
+        return None
+    return record["artifact"]
+
+
+def prune_artifacts(model_type, key):
+    # Only the newest artifact of a model type is kept; older data snapshots are never reloaded
+    for path in glob.glob(os.path.join(MODEL_STORE_DIR, f"{model_type}-*.joblib")):
+        if path != artifact_path(model_type, key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:  # Already pruned by another worker
+                pass
+
+
+def save_artifact(model_type, key, artifact, params=None, source_hash=None):
+    """
+    Atomically writes an artifact so concurrent readers never see a partial file,
+    then removes the older artifacts of the same model type.
+    """
+    os.makedirs(MODEL_STORE_DIR, exist_ok=True)
+    record = {
+        "key": key,
+        "store_version": STORE_VERSION,
+        "model_type": model_type,
+        "params": params,
+        "data": source_hash,
+        "created": time.time(),
+        "artifact": artifact,
+    }
+
+    # Write to a temp file in the same directory, then rename over the target
+    fd, tmp_path = tempfile.mkstemp(dir=MODEL_STORE_DIR, prefix=f".{model_type}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            joblib.dump(record, tmp_file)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        # mkstemp creates the file as 0600; workers running as another user must be able to read it
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, artifact_path(model_type, key))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    prune_artifacts(model_type, key)
+
+
+def load_or_fit(model_type, params, data, fit, dump=None, restore=None):
+    """
+    Returns the stored artifact for (model_type, params, data), fitting and storing it on a miss.
+
+    Parameters:
+    - model_type: Short name of the model, used in the artifact file name
+    - params: JSON-serializable hyperparameters of the model
+    - data: DataFrame or Series the model is trained on
+    - fit: Zero-argument callable that trains and returns the artifact
+    - dump: Optional callable reducing the artifact to what is stored (e.g. fitted parameters)
+    - restore: Optional callable rebuilding the artifact from what dump stored
+    """
+    source_hash = data_hash(data)
+    key = artifact_key(model_type, params, source_hash)
+
+    # Only the latest key per model type is kept in memory, like on disk
+    memo = _loaded.get(model_type)
+    if memo is not None and memo[0] == key:
+        return memo[1]
+
+    stored = load_artifact(model_type, key)
+    if stored is not None:
+        artifact = restore(stored) if restore is not None else stored
+        _loaded[model_type] = (key, artifact)
+        return artifact
+
+    artifact = fit()
+    _loaded[model_type] = (key, artifact)
+    try:
+        save_artifact(model_type, key, dump(artifact) if dump is not None else artifact,
+                      params=params, source_hash=source_hash)
+    except OSError as exc:  # A read-only store should not take the dashboard down
+        print(f"Could not persist model artifact {model_type}: {exc}")
+    return artifact
@@ -1,29 +1,46 @@
-import pandas as pd
 import numpy as np
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 from dash import dcc, html, Input, Output
 import plotly.graph_objects as go
 from dash import dcc, html
 
-# Load the dataset
-df = pd.read_csv("data/global_temperature.csv")
-df = df.groupby("Year")["Monthly Anomaly"].mean().reset_index()  # Aggregate to yearly data
+from datasets import get_datasets
+from figure_utils import optimize_figure
+from forecast_bands import UNCERTAINTY_MODES, add_uncertainty_traces
+from model_store import load_or_fit
+from profiling import profiled
+
+# SARIMA hyperparameters, also part of the model store key
+SARIMA_ORDER = (1, 1, 1)
+SARIMA_SEASONAL_ORDER = (1, 1, 1, 12)
+
+
+def fit_sarima(model_type, series):
+    # Fit the SARIMA model, or load it from the model store if this series was fitted before
+    def model():
+        return SARIMAX(series, order=SARIMA_ORDER, seasonal_order=SARIMA_SEASONAL_ORDER)
+
+    return load_or_fit(
+        model_type,
+        {"order": SARIMA_ORDER, "seasonal_order": SARIMA_SEASONAL_ORDER},
+        series,
+        lambda: model().fit(disp=False),
+        # Only the fitted parameters are stored; filtering with them rebuilds the results cheaply
+        dump=lambda results: np.asarray(results.params),
+        restore=lambda stored_params: model().filter(stored_params),
+    )
 
-# Train-Test Split
-train = df[df["Year"] <= 2000]
-test = df[df["Year"] > 2000]
 
-# Train a SARIMA Model
-model = SARIMAX(train["Monthly Anomaly"], order=(1, 1, 1), seasonal_order=(1, 1, 1, 12))
-model_fit = model.fit(disp=False)
+def fit_temperature_sarima(datasets):
+    # The model behind the forecast callback, trained on all yearly data of a snapshot
+    return fit_sarima("temperature_sarima", datasets.temperature_yearly["Monthly Anomaly"])
 
-# Forecast Future Values
-forecast_steps = len(test)
-forecast = model_fit.get_forecast(steps=forecast_steps)
-forecast_ci = forecast.conf_int()
 
 # Layout for the predictive modeling feature
 def get_predictive_modeling_layout():
+    # Load the dataset, aggregated to yearly data
+    df = get_datasets().temperature_yearly
+
     return html.Div([
         html.H2("Predictive Modeling: Temperature Anomalies"),
 
@@ -38,6 +55,16 @@ def get_predictive_modeling_layout():
             style={"marginBottom": "20px", "width": "100%"}
         ),
 
+        # Uncertainty display selection
+        html.Label("Forecast Uncertainty:"),
+        dcc.RadioItems(
+            id="temperature-uncertainty-mode",
+            options=UNCERTAINTY_MODES,
+            value="interval",
+            inline=True,
+            style={"marginBottom": "20px"},
+        ),
+
         # Graph display
         dcc.Graph(id="predictive-model-graph"),
     ])
@@ -46,16 +73,21 @@ def get_predictive_modeling_layout():
 def register_predictive_modeling_callbacks(app):
     @app.callback(
         Output("predictive-model-graph", "figure"),
-        [Input("forecast-year-input", "value")]
+        [Input("forecast-year-input", "value"),
+         Input("temperature-uncertainty-mode", "value")]
     )
-    def update_predictive_model(target_year):
+    @profiled("temperature_forecast")
+    def update_predictive_model(target_year, uncertainty_mode="interval"):
+        datasets = get_datasets()
+        df = datasets.temperature_yearly
+
         # Validate the target year
         if target_year is None or target_year <= df["Year"].max():
             target_year = df["Year"].max() + 1
 
-        # Calculate forecast steps
-        forecast_start = df["Year"].max()
-        forecast_steps = max(0, target_year - forecast_start + 1)
+        # Calculate forecast steps, starting the year after the last observation
+        forecast_start = int(df["Year"].max()) + 1
+        forecast_steps = max(0, int(target_year) - forecast_start + 1)
 
         # Initialize the figure
         fig = go.Figure()
@@ -70,13 +102,11 @@ def register_predictive_modeling_callbacks(app):
 
         if forecast_steps > 0:
             # Train the SARIMA model with full historical data
-            model = SARIMAX(df["Monthly Anomaly"], order=(1, 1, 1), seasonal_order=(1, 1, 1, 12))
-            model_fit = model.fit(disp=False)
+            model_fit = fit_temperature_sarima(datasets)
 
             # Forecast future values
             forecast = model_fit.get_forecast(steps=forecast_steps)
-            forecast_years = list(range(forecast_start, target_year + 1))
-            forecast_ci = forecast.conf_int()
+            forecast_years = np.arange(forecast_start, forecast_start + forecast_steps)
 
             # Add forecast to the plot
             fig.add_trace(go.Scatter(
@@ -86,15 +116,8 @@ def register_predictive_modeling_callbacks(app):
                 name="Forecast",
             ))
 
-            # Add confidence interval
-            fig.add_trace(go.Scatter(
-                x=forecast_years + forecast_years[::-1],
-                y=list(forecast_ci.iloc[:, 0]) + list(forecast_ci.iloc[:, 1])[::-1],
-                fill="toself",
-                name="Confidence Interval",
-                mode="lines",
-                line_color="rgba(0,0,0,0)",
-            ))
+            # Add the 95% confidence interval, or the fan chart bands
+            add_uncertainty_traces(fig, forecast_years, forecast, uncertainty_mode, interval_level=0.95)
 
         # Update layout
         fig.update_layout(
@@ -104,4 +127,4 @@ def register_predictive_modeling_callbacks(app):
             template="plotly_white",
         )
 
-        return fig
+        return optimize_figure(fig, decimals=3)
@@ -0,0 +1,102 @@
+import io
+import os
+import pstats
+import time
+
+import dash_bootstrap_components as dbc
+from dash import dcc, html, Input, Output
+
+from profiling import PROFILE_DIR, PROFILE_HEADER, PROFILE_THRESHOLD_MS, list_captures
+
+# Number of recent captures considered, and how many of the slowest are listed
+RECENT_CAPTURES = 100
+SLOWEST_SHOWN = 20
+
+
+def capture_time(capture):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(capture["timestamp"]))
+
+
+def format_arguments(arguments):
+    return ", ".join(f"{name}={value}" for name, value in arguments.items())
+
+
+# Layout for the profile viewer feature
+def get_profile_viewer_layout():
+    if PROFILE_THRESHOLD_MS > 0:
+        status = f"Callbacks slower than {PROFILE_THRESHOLD_MS:.0f} ms are captured."
+    else:
+        status = (f"Threshold capture is off (set DASH_PROFILE_THRESHOLD_MS). "
+                  f"Requests with the header {PROFILE_HEADER}: 1 are still captured.")
+
+    return html.Div([
+        html.H2("Slow Callback Profiles"),
+        html.P(status, className="text-muted"),
+
+        html.Button("Refresh", id="profile-refresh", n_clicks=0, className="btn btn-secondary mb-3"),
+
+        # Table of the slowest recent captures
+        html.Div(id="profile-table"),
+
+        # Capture selection and its hottest functions
+        html.Label("Select a Capture:"),
+        dcc.Dropdown(id="profile-selector", placeholder="Select a capture", style={"marginBottom": "10px"}),
+        html.Pre(id="profile-stats", style={"fontSize": "12px", "whiteSpace": "pre"}),
+    ])
+
+
+# Callbacks for the profile viewer
+def register_profile_viewer_callbacks(app):
+    @app.callback(
+        [Output("profile-table", "children"), Output("profile-selector", "options")],
+        [Input("profile-refresh", "n_clicks")]
+    )
+    def update_capture_list(n_clicks):
+        recent = list_captures()[:RECENT_CAPTURES]
+        slowest = sorted(recent, key=lambda capture: capture["elapsed_ms"], reverse=True)[:SLOWEST_SHOWN]
+        if not slowest:
+            return html.P(f"No captures in {PROFILE_DIR}/ yet."), []
+
+        table = dbc.Table(
+            [
+                html.Thead(html.Tr([
+                    html.Th("Callback"), html.Th("Time (ms)"), html.Th("Arguments"),
+                    html.Th("Captured"), html.Th("Trigger"),
+                ])),
+                html.Tbody([
+                    html.Tr([
+                        html.Td(capture["callback"]),
+                        html.Td(f"{capture['elapsed_ms']:,.0f}", className="text-danger"),
+                        html.Td(format_arguments(capture["arguments"])),
+                        html.Td(capture_time(capture)),
+                        html.Td(capture["trigger"]),
+                    ]) for capture in slowest
+                ]),
+            ],
+            striped=True,
+            hover=True,
+            responsive=True,
+        )
+        options = [
+            {"label": f"{capture['callback']} - {capture['elapsed_ms']:,.0f} ms - {capture_time(capture)}",
+             "value": capture["profile"]}
+            for capture in slowest
+        ]
+        return table, options
+
+    @app.callback(
+        Output("profile-stats", "children"),
+        [Input("profile-selector", "value")]
+    )
+    def show_capture(profile):
+        if not profile:
+            return "Select a capture to see its slowest functions."
+
+        # Only open files inside the profile directory
+        path = os.path.join(PROFILE_DIR, os.path.basename(profile))
+        if not os.path.exists(path):
+            return "This capture no longer exists."
+
+        stream = io.StringIO()
+        pstats.Stats(path, stream=stream).strip_dirs().sort_stats("cumulative").print_stats(30)
+        return stream.getvalue()
@@ -0,0 +1,122 @@
+import cProfile
+import functools
+import glob
+import inspect
+import json
+import os
+import threading
+import time
+
+# Set DASH_PROFILE_ENABLED=1 to accept the profiling header and show the profile viewer tab.
+# Off by default: captures expose internal paths and other users' callback arguments.
+PROFILE_ENABLED = os.environ.get("DASH_PROFILE_ENABLED", "0") == "1"
+
+# Directory the captures are written to (override with DASH_PROFILE_DIR)
+PROFILE_DIR = os.environ.get("DASH_PROFILE_DIR", "profiles")
+
+# Profile every callback and keep the captures slower than this many milliseconds (0 disables)
+PROFILE_THRESHOLD_MS = float(os.environ.get("DASH_PROFILE_THRESHOLD_MS", 0))
+
+# With PROFILE_ENABLED, requests carrying this header set to 1 are always profiled and captured
+PROFILE_HEADER = "X-Dash-Profile"
+
+# Oldest captures are deleted beyond this count
+MAX_CAPTURES = int(os.environ.get("DASH_PROFILE_MAX_CAPTURES", 200))
+
+# Only one cProfile profiler can be active at a time; other calls run unprofiled meanwhile
+_profiler_lock = threading.Lock()
+
+
+def _header_requested():
+    if not PROFILE_ENABLED:
+        return False
+
+    from flask import has_request_context, request
+
+    return has_request_context() and request.headers.get(PROFILE_HEADER) == "1"
+
+
+def save_capture(name, arguments, elapsed_ms, profiler, trigger):
+    """
+    Writes the profile (<capture>.prof, readable with pstats, snakeviz or flameprof) and its
+    metadata (<capture>.json) to PROFILE_DIR.
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    timestamp = time.time()
+    capture = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(timestamp))}-{name}-{os.getpid()}-{int(elapsed_ms)}ms"
+    base_path = os.path.join(PROFILE_DIR, capture)
+
+    profiler.dump_stats(base_path + ".prof")
+    with open(base_path + ".json", "w") as meta_file:
+        json.dump({
+            "callback": name,
+            "arguments": arguments,
+            "elapsed_ms": elapsed_ms,
+            "timestamp": timestamp,
+            "trigger": trigger,
+            "pid": os.getpid(),
+            "profile": capture + ".prof",
+        }, meta_file, default=str)
+
+    # Drop the oldest captures
+    captures = sorted(glob.glob(os.path.join(PROFILE_DIR, "*.json")), key=os.path.getmtime)
+    for old in captures[:-MAX_CAPTURES]:
+        for path in (old, old[:-len(".json")] + ".prof"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def profiled(name):
+    """
+    Decorator that profiles a Dash callback when profiling is enabled.
+
+    A call is profiled when PROFILE_ENABLED is set and the request carries the PROFILE_HEADER
+    header, or when PROFILE_THRESHOLD_MS is set; in that case only calls slower than the
+    threshold are kept.
+    The profile is saved together with the callback's input arguments.
+    """
+    def decorator(func):
+        arg_names = list(inspect.signature(func).parameters)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            forced = _header_requested()
+            if not forced and PROFILE_THRESHOLD_MS <= 0:
+                return func(*args, **kwargs)
+            if not _profiler_lock.acquire(blocking=False):
+                return func(*args, **kwargs)
+
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            try:
+                profiler.enable()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    profiler.disable()
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    if forced or elapsed_ms >= PROFILE_THRESHOLD_MS:
+                        arguments = dict(zip(arg_names, args))
+                        arguments.update(kwargs)
+                        try:
+                            save_capture(name, arguments, elapsed_ms, profiler, "header" if forced else "threshold")
+                        except OSError as exc:  # Never fail the callback because a capture could not be written
+                            print(f"Could not save profile for {name}: {exc}")
+            finally:
+                _profiler_lock.release()
+        return wrapper
+    return decorator
+
+
+def list_captures():
+    """
+    Returns the metadata of every saved capture, newest first.
+    """
+    captures = []
+    for path in glob.glob(os.path.join(PROFILE_DIR, "*.json")):
+        try:
+            with open(path) as meta_file:
+                captures.append(json.load(meta_file))
+        except (OSError, json.JSONDecodeError):
+            continue
+    return sorted(captures, key=lambda capture: capture["timestamp"], reverse=True)
@@ -0,0 +1,79 @@
+import argparse
+import gc
+import multiprocessing
+import os
+
+from gunicorn.app.base import BaseApplication
+
+
+def preload():
+    """
+    Loads the Dash app, every dataset, the model evaluation and the temperature SARIMA model in the master process.
+
+    The models are kept in model_store's in-process memo, so workers forked afterwards share
+    these pages copy-on-write instead of each loading their own copies.
+    """
+    from datasets import get_datasets
+    from main import server, warm_caches
+
+    warm_caches(get_datasets())
+    return server
+
+
+def when_ready(arbiter):
+    # Move everything loaded so far out of the GC's reach, so collections in the
+    # workers do not touch (and therefore copy) the shared pages
+    gc.freeze()
+
+
+def post_fork(arbiter, worker):
+    # Threads do not survive fork, so each worker polls the data directory itself.
+    # Tradeoff: after a data update every worker reads the CSVs into its own new snapshot,
+    # so the datasets are no longer shared copy-on-write until the server is restarted.
+    # Model fitting is not duplicated: the refresh hooks run under a file lock, so one
+    # worker fits and stores the models and the others load them from the model store.
+    from datasets import start_refresher
+
+    start_refresher()
+
+
+class DashServer(BaseApplication):
+    """
+    Gunicorn application serving main.py's Dash app with the datasets preloaded before forking.
+    """
+
+    def __init__(self, options):
+        self.options = options
+        self.application = preload()
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Global Climate Dashboard with gunicorn.")
+    parser.add_argument("--bind", default=os.environ.get("DASH_BIND", "0.0.0.0:8050"))
+    parser.add_argument("--workers", type=int,
+                        default=int(os.environ.get("DASH_WORKERS", multiprocessing.cpu_count())))
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("DASH_THREADS", 1)))
+    parser.add_argument("--timeout", type=int, default=int(os.environ.get("DASH_TIMEOUT", 120)))
+    args = parser.parse_args()
+
+    DashServer({
+        "bind": args.bind,
+        "workers": args.workers,
+        "threads": args.threads,
+        "timeout": args.timeout,
+        "preload_app": True,
+        "when_ready": when_ready,
+        "post_fork": post_fork,
+    }).run()
+
+
+if __name__ == "__main__":
+    main()